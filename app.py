@@ -1,14 +1,18 @@
 import streamlit as st
+import concurrent.futures
 import os
 import json
-from datetime import datetime
+import orjson
+import tempfile
 from pathlib import Path
 from pdf_data_object import create_pdf_data_object
 import base64
 from PyPDF2 import PdfReader
 import logging
-from did_generator import generate_did_key
-from cryptography.hazmat.primitives import serialization
+from did_generator import generate_did_key, load_pem_private_key
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 # Configure logging
 logging.basicConfig(
@@ -17,11 +21,86 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Size of the chunks used when writing uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Buffer size used when reading PDF files
+PDF_READ_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Session state key of the latest data object job, and how often to poll it (seconds)
+CREATE_JOB_KEY = "create_data_object_job"
+JOB_POLL_INTERVAL = 0.5
+
 # Function to encode file content as base64
 def encode_file_to_base64(file_path):
     with open(file_path, "rb") as f:
         return base64.b64encode(f.read()).decode('utf-8')
 
+def save_uploaded_file(uploaded_file, suffix: str = "", chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """
+    Stream an uploaded file to a new temporary file in fixed-size chunks.
+    
+    Returns the path of the temporary file; the caller is responsible for removing it.
+    """
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(prefix="temp_", suffix=suffix, delete=False) as f:
+        while chunk := uploaded_file.read(chunk_size):
+            f.write(chunk)
+    return f.name
+
+def remove_temp_file(path: str) -> None:
+    """Delete a temporary file, ignoring one that is already gone."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+@st.cache_resource
+def get_worker_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Worker pool for data object creation, shared by all sessions and reruns.
+    """
+    return concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_create_data_object_job():
+    """
+    Show the outcome of the background data object job, or a progress note while it runs.
+    
+    Runs as a fragment polled every JOB_POLL_INTERVAL, so only the job area is
+    redrawn and the rest of the page stays interactive while the job is pending.
+    """
+    future = st.session_state.get(CREATE_JOB_KEY)
+    if future is None:
+        return
+    
+    if not future.done():
+        st.info("Creating data object...")
+        return
+    
+    try:
+        result = future.result()
+        
+        # Display results
+        st.success("Data Object Created Successfully!")
+        st.json(result["data_object"])
+        
+        # create_pdf_data_object reports where it wrote the output PDF
+        output_pdf = result["output_path"]
+        
+        if output_pdf:
+            # Serve the output PDF through Streamlit's media endpoint
+            with open(output_pdf, 'rb') as f:
+                st.download_button(
+                    label="Download Output PDF",
+                    data=f,
+                    file_name=Path(output_pdf).name,
+                    mime="application/pdf"
+                )
+            
+    except Exception as e:
+        st.error(f"Error creating data object: {str(e)}")
+
 def dump_pdf_metadata(pdf_path: str) -> dict:
     """
     Extract and display metadata from a PDF file, including our custom DataObject metadata.
@@ -32,37 +111,39 @@ def dump_pdf_metadata(pdf_path: str) -> dict:
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
             
         logger.info(f"Reading PDF: {pdf_path}")
-        pdf_reader = PdfReader(pdf_path)
+        with open(pdf_path, 'rb', buffering=PDF_READ_BUFFER_SIZE) as pdf_file:
+            pdf_reader = PdfReader(pdf_file, strict=False)
+            pdf_info = pdf_reader.metadata or {}
         
-        # Get standard PDF metadata
-        metadata = {
-            "Standard Metadata": {
-                "Title": pdf_reader.metadata.get("/Title"),
-                "Author": pdf_reader.metadata.get("/Author"),
-                "Subject": pdf_reader.metadata.get("/Subject"),
-                "Keywords": pdf_reader.metadata.get("/Keywords"),
-                "Creator": pdf_reader.metadata.get("/Creator"),
-                "Producer": pdf_reader.metadata.get("/Producer"),
-                "CreationDate": pdf_reader.metadata.get("/CreationDate"),
-                "ModDate": pdf_reader.metadata.get("/ModDate")
+            # Get standard PDF metadata
+            metadata = {
+                "Standard Metadata": {
+                    "Title": pdf_info.get("/Title"),
+                    "Author": pdf_info.get("/Author"),
+                    "Subject": pdf_info.get("/Subject"),
+                    "Keywords": pdf_info.get("/Keywords"),
+                    "Creator": pdf_info.get("/Creator"),
+                    "Producer": pdf_info.get("/Producer"),
+                    "CreationDate": pdf_info.get("/CreationDate"),
+                    "ModDate": pdf_info.get("/ModDate")
+                }
             }
-        }
         
-        # Get our custom DataObject metadata
-        if "/DataObject" in pdf_reader.metadata:
-            try:
-                data_object = json.loads(pdf_reader.metadata["/DataObject"])
-                metadata["DataObject"] = data_object
-            except json.JSONDecodeError:
-                logger.warning("Could not parse DataObject metadata as JSON")
-                metadata["DataObject"] = pdf_reader.metadata["/DataObject"]
+            # Get our custom DataObject metadata
+            if "/DataObject" in pdf_info:
+                try:
+                    data_object = json.loads(pdf_info["/DataObject"])
+                    metadata["DataObject"] = data_object
+                except json.JSONDecodeError:
+                    logger.warning("Could not parse DataObject metadata as JSON")
+                    metadata["DataObject"] = pdf_info["/DataObject"]
         
-        # Add additional useful information
-        metadata["Additional Info"] = {
-            "Page Count": len(pdf_reader.pages),
-            "File Size": pdf_path.stat().st_size,
-            "File Path": str(pdf_path)
-        }
+            # Add additional useful information
+            metadata["Additional Info"] = {
+                "Page Count": len(pdf_reader.pages),
+                "File Size": pdf_path.stat().st_size,
+                "File Path": str(pdf_path)
+            }
         
         return metadata
     
@@ -73,23 +154,38 @@ def dump_pdf_metadata(pdf_path: str) -> dict:
 def create_child_did(parent_did: str, parent_private_key: str, child_index: int) -> dict:
     """
     Create a child DID based on a parent DID and its private key.
+    
+    The child key is derived deterministically from the parent's Ed25519 seed
+    with HKDF-SHA256, using the child index as the HKDF info.
     """
     try:
-        # Load parent private key
-        private_key = serialization.load_pem_private_key(
-            parent_private_key.encode(),
-            password=b'your-secure-password',
-            backend=None
+        # Load parent private key, plain or exported with a password
+        private_key = load_pem_private_key(parent_private_key.encode())
+        if not isinstance(private_key, ed25519.Ed25519PrivateKey):
+            raise ValueError("Parent private key must be an Ed25519 key")
+        
+        parent_seed = private_key.private_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PrivateFormat.Raw,
+            encryption_algorithm=serialization.NoEncryption()
         )
         
-        # Generate child key pair
-        child_private_key = private_key.private_bytes(
+        # Derive child key pair from the parent seed
+        child_seed = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=str(child_index).encode()
+        ).derive(parent_seed)
+        child_key = ed25519.Ed25519PrivateKey.from_private_bytes(child_seed)
+        
+        child_private_key = child_key.private_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PrivateFormat.PKCS8,
             encryption_algorithm=serialization.NoEncryption()
         )
         
-        child_public_key = private_key.public_key().public_bytes(
+        child_public_key = child_key.public_key().public_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
         )
@@ -141,6 +237,11 @@ def main():
         output_dir = st.text_input("Output Directory (optional)", value="output")
         
         if st.button("Create Data Object"):
+            pending_job = st.session_state.get(CREATE_JOB_KEY)
+            if pending_job is not None and not pending_job.done():
+                st.warning("A data object is already being created; please wait for it to finish")
+                return
+            
             if not uploaded_file:
                 st.error("Please upload a PDF file")
                 return
@@ -157,58 +258,30 @@ def main():
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
                 
+            pdf_path = None
             try:
-                # Save uploaded files temporarily
-                pdf_path = f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                key_path = f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pem"
-                
-                with open(pdf_path, 'wb') as f:
-                    f.write(uploaded_file.getbuffer())
-                    
-                with open(key_path, 'wb') as f:
-                    f.write(public_key.getbuffer())
-                
-                # Read the public key content
-                with open(key_path, 'rb') as f:
-                    public_key_content = f.read()
-                
-                # Create data object
-                result = create_pdf_data_object(pdf_path, owner_did, public_key_content.decode('utf-8'), output_dir)
-                
-                # Display results
-                st.success("Data Object Created Successfully!")
-                st.json(json.loads(result))
+                # Save uploaded file temporarily
+                pdf_path = save_uploaded_file(uploaded_file, suffix=".pdf")
                 
-                # Find the output PDF
-                output_pdf = None
-                if output_dir:
-                    for file in os.listdir(output_dir):
-                        if file.startswith("data_object_") and file.endswith(".pdf"):
-                            output_pdf = os.path.join(output_dir, file)
-                            break
-                else:
-                    for file in os.listdir():
-                        if file.startswith("data_object_") and file.endswith(".pdf"):
-                            output_pdf = file
-                            break
+                # Create data object in the background so the UI stays responsive
+                future = get_worker_pool().submit(
+                    create_pdf_data_object,
+                    pdf_path,
+                    {"id": owner_did},
+                    public_key.getvalue().decode('utf-8'),
+                    output_dir
+                )
+                # The temporary file goes as soon as the job ends, even if it is never rendered
+                future.add_done_callback(lambda _, path=pdf_path: remove_temp_file(path))
+                st.session_state[CREATE_JOB_KEY] = future
                 
-                if output_pdf:
-                    # Create download link for the output PDF
-                    with open(output_pdf, 'rb') as f:
-                        pdf_bytes = f.read()
-                    b64_pdf = base64.b64encode(pdf_bytes).decode()
-                    href = f'<a href="data:application/pdf;base64,{b64_pdf}" download="{output_pdf}">Download Output PDF</a>'
-                    st.markdown(href, unsafe_allow_html=True)
-                    
             except Exception as e:
                 st.error(f"Error creating data object: {str(e)}")
-                
-            finally:
-                # Clean up temporary files
-                if os.path.exists(pdf_path):
-                    os.remove(pdf_path)
-                if os.path.exists(key_path):
-                    os.remove(key_path)
+                # Clean up temporary file
+                if pdf_path:
+                    remove_temp_file(pdf_path)
+        
+        render_create_data_object_job()
     
     with tab2:
         st.header("View PDF Metadata")
@@ -221,12 +294,11 @@ def main():
                 st.error("Please upload a PDF file")
                 return
                 
+            temp_pdf_path = None
             try:
                 # Save uploaded file temporarily
-                temp_pdf_path = f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_metadata.pdf"
-                with open(temp_pdf_path, 'wb') as f:
-                    f.write(metadata_file.getbuffer())
-                    
+                temp_pdf_path = save_uploaded_file(metadata_file, suffix="_metadata.pdf")
+                
                 # Extract and display metadata
                 metadata = dump_pdf_metadata(temp_pdf_path)
                 st.json(metadata)
@@ -236,8 +308,8 @@ def main():
             
             finally:
                 # Clean up temporary file
-                if os.path.exists(temp_pdf_path):
-                    os.remove(temp_pdf_path)
+                if temp_pdf_path:
+                    os.unlink(temp_pdf_path)
 
     with tab3:
         st.header("DID Management")
@@ -246,7 +318,7 @@ def main():
         st.subheader("Generate New DID")
         if st.button("Generate DID"):
             try:
-                result = generate_did_key()
+                result = generate_did_key(encrypt=True)
                 st.success("DID Generated Successfully!")
                 
                 # Display results
@@ -259,13 +331,18 @@ def main():
                 # Add download buttons
                 st.download_button(
                     label="Download DID Document",
-                    data=json.dumps(result["document"], indent=2),
+                    data=orjson.dumps(result["document"], option=orjson.OPT_INDENT_2),
                     file_name="did_document.json",
                     mime="application/json"
                 )
                 
-                # Extract public key from the document
-                public_key_pem = result["document"]["verificationMethod"][0]["publicKeyPem"]
+                # Wrap the raw public key as PEM for download
+                public_key_pem = ed25519.Ed25519PublicKey.from_public_bytes(
+                    result["public_key_raw"]
+                ).public_bytes(
+                    encoding=serialization.Encoding.PEM,
+                    format=serialization.PublicFormat.SubjectPublicKeyInfo
+                )
                 
                 # Add download button for public key
                 st.download_button(
@@ -277,7 +354,7 @@ def main():
                 
                 st.download_button(
                     label="Download Private Key",
-                    data=result["private_key"],
+                    data=result["private_key_pem"],
                     file_name="private_key.pem",
                     mime="application/x-pem-file"
                 )
@@ -320,7 +397,7 @@ def main():
                 # Add download buttons for child DID
                 st.download_button(
                     label="Download Child DID Document",
-                    data=json.dumps(result["document"], indent=2),
+                    data=orjson.dumps(result["document"], option=orjson.OPT_INDENT_2),
                     file_name=f"child_did_{child_index}_document.json",
                     mime="application/json"
                 )
@@ -1,18 +1,76 @@
 from dataclasses import dataclass
+from functools import cached_property
+import functools
 import hashlib
 import json
-from datetime import datetime
-from typing import Any, Dict, Optional, List
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, List, Tuple, Union
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.asymmetric import padding, rsa, x25519
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import padding as sym_padding
-from Crypto.Cipher import PKCS1_OAEP
-from Crypto.PublicKey import RSA
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 import os
+import struct
+import zlib
+
+# RSA-OAEP parameters used to wrap the AES key
+_OAEP = padding.OAEP(
+    mgf=padding.MGF1(algorithm=hashes.SHA256()),
+    algorithm=hashes.SHA256(),
+    label=None
+)
+
+# HKDF info string used to derive the AES key from an X25519 shared secret
+_X25519_KDF_INFO = b'dataobject'
+
+# Header of the packed encrypted_content blob: flags, nonce length, wrapped key length
+_BLOB_HEADER = struct.Struct('<BHH')
+
+# Blob flag set when the plaintext was zlib-compressed before encryption
+_FLAG_ZLIB = 0x01
+
+# zlib level used to compress content before encryption
+_ZLIB_LEVEL = 3
+
+# Parameters of the legacy PyCryptodome PKCS1_OAEP wrap (SHA-1), kept for
+# objects created before the switch to AES-GCM
+_LEGACY_OAEP = padding.OAEP(
+    mgf=padding.MGF1(algorithm=hashes.SHA1()),
+    algorithm=hashes.SHA1(),
+    label=None
+)
+
+@functools.lru_cache(maxsize=128)
+def _load_public_key(pem: str) -> Union[rsa.RSAPublicKey, x25519.X25519PublicKey]:
+    """Parse a PEM public key, reusing the parsed key for repeated PEM strings."""
+    return serialization.load_pem_public_key(pem.encode('utf-8'))
+
+@functools.lru_cache(maxsize=128)
+def _load_private_key(pem: str) -> Union[rsa.RSAPrivateKey, x25519.X25519PrivateKey]:
+    """Parse an unencrypted PEM private key, reusing the parsed key for repeated PEM strings."""
+    return serialization.load_pem_private_key(pem.encode('utf-8'), password=None)
+
+def _derive_x25519_aes_key(shared_secret: bytes) -> bytes:
+    """Derive a 256-bit AES key from an X25519 shared secret."""
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=_X25519_KDF_INFO
+    ).derive(shared_secret)
+
+@functools.lru_cache(maxsize=4096)
+def _did_sha256(did: str) -> str:
+    """Hex SHA-256 of a DID, memoized since many objects share an owner."""
+    return hashlib.sha256(did.encode('utf-8')).hexdigest()
+
+def _canonical_json(content: Dict[str, Any]) -> bytes:
+    """Serialize content to the canonical bytes that are hashed and encrypted."""
+    return json.dumps(content, sort_keys=True).encode('utf-8')
 
 @dataclass(frozen=True)
 class ValidityCondition:
@@ -52,7 +110,8 @@ class DataObject:
         data_type: str,
         content: Dict[str, Any],
         owner_public_key: str,
-        validity_conditions: Optional[List[Dict[str, Any]]] = None
+        validity_conditions: Optional[List[Dict[str, Any]]] = None,
+        created_at_override: Optional[datetime] = None
     ) -> 'DataObject':
         """
         Create a new DataObject using hybrid encryption.
@@ -61,48 +120,60 @@ class DataObject:
             owner_did: The DID of the owner
             data_type: The type of data being stored
             content: The content to be stored (must be JSON-serializable)
-            owner_public_key: The owner's public key in PEM format
+            owner_public_key: The owner's RSA or X25519 public key in PEM format
             validity_conditions: Optional list of validity conditions
+            created_at_override: Optional timezone-aware creation timestamp, so batch
+                callers can read the clock once and reuse it for every object
             
         Returns:
             A new immutable DataObject instance
         """
         # Calculate owner DID hash
-        owner_hash = hashlib.sha256(owner_did.encode('utf-8')).hexdigest()
+        owner_hash = _did_sha256(owner_did)
         
         # Get current timestamp
-        created_at = datetime.utcnow()
+        if created_at_override is not None and created_at_override.utcoffset() is None:
+            raise ValueError("created_at_override must be timezone-aware")
+        created_at = created_at_override or datetime.now(timezone.utc)
         
-        # Calculate content hash
-        content_json = json.dumps(content, sort_keys=True).encode('utf-8')
+        # Serialize the content once; the same bytes are hashed and encrypted
+        content_json = _canonical_json(content)
         content_hash = hashlib.sha256(content_json).hexdigest()
         
-        # Generate a random AES key
-        aes_key = os.urandom(32)  # 256-bit key
-        
-        # Encrypt content using AES
-        iv = os.urandom(16)  # 128-bit IV
-        cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv))
-        encryptor = cipher.encryptor()
-        
-        # Pad the content
-        padder = sym_padding.PKCS7(128).padder()
-        padded_data = padder.update(content_json) + padder.finalize()
+        public_key = _load_public_key(owner_public_key)
+        if isinstance(public_key, x25519.X25519PublicKey):
+            # Agree on the AES key with an ephemeral X25519 key; store its public half
+            ephemeral_key = x25519.X25519PrivateKey.generate()
+            aes_key = _derive_x25519_aes_key(ephemeral_key.exchange(public_key))
+            encrypted_aes_key = ephemeral_key.public_key().public_bytes(
+                encoding=serialization.Encoding.Raw,
+                format=serialization.PublicFormat.Raw
+            )
+        elif isinstance(public_key, rsa.RSAPublicKey):
+            # Generate a random AES key and encrypt it using RSA
+            aes_key = os.urandom(32)  # 256-bit key
+            encrypted_aes_key = public_key.encrypt(aes_key, _OAEP)
+        else:
+            raise ValueError("unsupported owner key type")
         
-        # Encrypt the padded data
-        encrypted_content = encryptor.update(padded_data) + encryptor.finalize()
+        # Compress the content before encryption, unless that would grow it
+        flags = 0
+        plaintext = zlib.compress(content_json, _ZLIB_LEVEL)
+        if len(plaintext) < len(content_json):
+            flags |= _FLAG_ZLIB
+        else:
+            plaintext = content_json
         
-        # Encrypt the AES key using RSA
-        public_key = RSA.import_key(owner_public_key)
-        cipher_rsa = PKCS1_OAEP.new(public_key)
-        encrypted_aes_key = cipher_rsa.encrypt(aes_key)
+        # Encrypt and authenticate content using AES-GCM
+        nonce = os.urandom(12)  # 96-bit nonce
+        ciphertext = AESGCM(aes_key).encrypt(nonce, plaintext, None)
         
-        # Combine encrypted content and encrypted key
-        encrypted_data = {
-            "encrypted_content": base64.b64encode(encrypted_content).decode('utf-8'),
-            "encrypted_key": base64.b64encode(encrypted_aes_key).decode('utf-8'),
-            "iv": base64.b64encode(iv).decode('utf-8')
-        }
+        # Pack nonce, encrypted key and ciphertext into one blob and encode it once
+        blob = bytearray(_BLOB_HEADER.pack(flags, len(nonce), len(encrypted_aes_key)))
+        blob += nonce
+        blob += encrypted_aes_key
+        blob += ciphertext
+        encrypted_data = base64.b64encode(memoryview(blob)).decode('ascii')
         
         # Initialize validity conditions
         if validity_conditions is None:
@@ -122,7 +193,7 @@ class DataObject:
             owner_did_hash=owner_hash,
             data_type=data_type,
             content=content,
-            encrypted_content=json.dumps(encrypted_data),
+            encrypted_content=encrypted_data,
             created_at=created_at,
             content_hash=content_hash,
             state="active",
@@ -134,27 +205,68 @@ class DataObject:
         Decrypt the content using the owner's private key.
         
         Args:
-            owner_private_key: The owner's private key in PEM format
+            owner_private_key: The owner's RSA or X25519 private key in PEM format
+            
+        Returns:
+            The decrypted content as a dictionary
+        """
+        private_key = _load_private_key(owner_private_key)
+        if not isinstance(private_key, (rsa.RSAPrivateKey, x25519.X25519PrivateKey)):
+            raise ValueError("unsupported owner key type")
+        
+        # Objects created before the packed format store a JSON dictionary
+        if self.encrypted_content.startswith('{'):
+            if not isinstance(private_key, rsa.RSAPrivateKey):
+                raise ValueError("unsupported owner key type")
+            return self._decrypt_legacy_content(json.loads(self.encrypted_content), private_key)
+        
+        blob = memoryview(base64.b64decode(self.encrypted_content))
+        flags, nonce_len, key_len = _BLOB_HEADER.unpack_from(blob)
+        nonce_end = _BLOB_HEADER.size + nonce_len
+        key_end = nonce_end + key_len
+        
+        encrypted_aes_key = bytes(blob[nonce_end:key_end])
+        if isinstance(private_key, x25519.X25519PrivateKey):
+            ephemeral_public_key = x25519.X25519PublicKey.from_public_bytes(encrypted_aes_key)
+            aes_key = _derive_x25519_aes_key(private_key.exchange(ephemeral_public_key))
+        else:
+            aes_key = private_key.decrypt(encrypted_aes_key, _OAEP)
+        
+        nonce = bytes(blob[_BLOB_HEADER.size:nonce_end])
+        decrypted_content = AESGCM(aes_key).decrypt(nonce, blob[key_end:], None)
+        if flags & _FLAG_ZLIB:
+            decrypted_content = zlib.decompress(decrypted_content)
+        
+        return json.loads(decrypted_content.decode('utf-8'))
+    
+    @staticmethod
+    def _decrypt_legacy_content(encrypted_data: Dict[str, str], private_key: rsa.RSAPrivateKey) -> Dict[str, Any]:
+        """
+        Decrypt content stored in the legacy AES-CBC format.
+        
+        Args:
+            encrypted_data: The decoded encrypted_content dictionary
+            private_key: The owner's RSA private key
             
         Returns:
             The decrypted content as a dictionary
         """
-        encrypted_data = json.loads(self.encrypted_content)
         encrypted_aes_key = base64.b64decode(encrypted_data["encrypted_key"])
         encrypted_content = base64.b64decode(encrypted_data["encrypted_content"])
         iv = base64.b64decode(encrypted_data["iv"])
         
-        private_key = RSA.import_key(owner_private_key)
-        cipher_rsa = PKCS1_OAEP.new(private_key)
-        aes_key = cipher_rsa.decrypt(encrypted_aes_key)
+        aes_key = private_key.decrypt(encrypted_aes_key, _LEGACY_OAEP)
         
         cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv))
         decryptor = cipher.decryptor()
         
         decrypted_padded_data = decryptor.update(encrypted_content) + decryptor.finalize()
         
-        unpadder = sym_padding.PKCS7(128).unpadder()
-        decrypted_content = unpadder.update(decrypted_padded_data) + unpadder.finalize()
+        # Strip the PKCS7 padding
+        pad_len = decrypted_padded_data[-1] if decrypted_padded_data else 0
+        if not 1 <= pad_len <= 16 or decrypted_padded_data[-pad_len:] != bytes([pad_len]) * pad_len:
+            raise ValueError("Invalid padding bytes.")
+        decrypted_content = decrypted_padded_data[:-pad_len]
         
         return json.loads(decrypted_content.decode('utf-8'))
     
@@ -168,7 +280,7 @@ class DataObject:
         Returns:
             True if the DID matches the owner hash, False otherwise
         """
-        return hashlib.sha256(owner_did.encode('utf-8')).hexdigest() == self.owner_did_hash
+        return _did_sha256(owner_did) == self.owner_did_hash
     
     def verify_content(self) -> bool:
         """
@@ -177,7 +289,7 @@ class DataObject:
         Returns:
             True if the content hash is valid, False otherwise
         """
-        content_json = json.dumps(self.content, sort_keys=True).encode('utf-8')
+        content_json = _canonical_json(self.content)
         return hashlib.sha256(content_json).hexdigest() == self.content_hash
     
     def is_valid(self) -> bool:
@@ -190,19 +302,35 @@ class DataObject:
         if self.state != "active":
             return False
         
-        # Check validity conditions
+        return all(check(self) for check in self._checkers)
+    
+    @cached_property
+    def _checkers(self) -> Tuple[Callable[['DataObject'], bool], ...]:
+        """
+        Validity conditions compiled into checks, parsed once per object.
+        
+        Returns:
+            A tuple of callables that return False when their condition fails
+        """
+        checkers = []
         for condition in self.validity_conditions:
             if condition.condition_type == "expiration":
                 expiration_date = datetime.fromisoformat(condition.parameters["date"])
-                if datetime.utcnow() > expiration_date:
-                    return False
+                # Dates without an offset were written as naive UTC
+                if expiration_date.tzinfo is None:
+                    expiration_date = expiration_date.replace(tzinfo=timezone.utc)
+                checkers.append(
+                    lambda obj, expiration_date=expiration_date: datetime.now(timezone.utc) <= expiration_date
+                )
             elif condition.condition_type == "version":
                 if "min_version" in condition.parameters:
-                    if self.content.get("version", "0") < condition.parameters["min_version"]:
-                        return False
+                    min_version = condition.parameters["min_version"]
+                    checkers.append(
+                        lambda obj, min_version=min_version: not obj.content.get("version", "0") < min_version
+                    )
             # Add more condition types as needed
         
-        return True
+        return tuple(checkers)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -262,22 +390,29 @@ class DataObject:
 
 if __name__ == "__main__":
     # Example usage
-    from Crypto.PublicKey import RSA
     
     # Generate a key pair for encryption
-    key = RSA.generate(2048)
-    private_key = key.export_key().decode('utf-8')
-    public_key = key.publickey().export_key().decode('utf-8')
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_key = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    ).decode('utf-8')
+    public_key = key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode('utf-8')
     
     # Create a mock DID
     owner_did = "did:example:123456789"
+    now = datetime.now(timezone.utc)
     
     # Define validity conditions
     validity_conditions = [
         {
             "type": "expiration",
             "parameters": {
-                "date": (datetime.utcnow().replace(year=datetime.utcnow().year + 1)).isoformat()
+                "date": (now + timedelta(days=365)).isoformat()
             },
             "description": "Data expires in one year"
         },
@@ -1,9 +1,45 @@
-import sqlite3
 import json
-from typing import Dict, Any, Optional
+import re
+import sqlite3
+import threading
+import orjson
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from pathlib import Path
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+
+def _utc_isoformat(timestamp: Optional[datetime] = None) -> str:
+    """Format a timestamp (default: now) as aware UTC ISO 8601; naive timestamps are rejected."""
+    if timestamp is None:
+        return datetime.now(timezone.utc).isoformat()
+    if timestamp.utcoffset() is None:
+        raise ValueError("created_at_override must be timezone-aware")
+    return timestamp.astimezone(timezone.utc).isoformat()
+
+# Integer literals orjson.loads cannot read exactly (it returns them as floats)
+_WIDE_INT_RE = re.compile(r'\d{20,}')
+
+def _dumps_json(obj: Any) -> str:
+    """Serialize a JSON column with orjson, raising on values it cannot store exactly."""
+    try:
+        text = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # e.g. integers wider than 64 bits, which json writes exactly
+        return json.dumps(obj, allow_nan=False)
+    if b'null' in text:
+        # orjson writes NaN and infinities as null; refuse them instead
+        json.dumps(obj, allow_nan=False)
+    return text.decode('utf-8')
+
+def _loads_json(text: str) -> Any:
+    """Decode a JSON column with orjson, falling back to json for what orjson cannot read exactly."""
+    if _WIDE_INT_RE.search(text) is None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # e.g. NaN or Infinity in rows written by json.dumps
+            pass
+    return json.loads(text)
 
 class DataObjectDB:
     def __init__(self, db_path: str = "dataobjects.db"):
@@ -14,27 +50,48 @@ class DataObjectDB:
             db_path: Path to the SQLite database file
         """
         self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        # The connection is shared between threads; every use of it holds this lock
+        self._lock = threading.Lock()
+        self._configure_connection()
         self._initialize_db()
     
+    def _configure_connection(self):
+        """Enable WAL journaling and relaxed syncing on the persistent connection."""
+        cursor = self.conn.cursor()
+        # page_size only applies to a new database, so it must precede the WAL switch
+        cursor.execute("PRAGMA page_size=8192")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+    
     def _initialize_db(self):
         """Create the database and table if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS dataobjects (
-                    uuid TEXT PRIMARY KEY,
-                    created_at TEXT NOT NULL,
-                    data_object TEXT NOT NULL,
-                    pdf_hash TEXT NOT NULL,
-                    did_document TEXT NOT NULL
-                )
-            ''')
-            conn.commit()
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dataobjects (
+                uuid TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                data_object TEXT NOT NULL,
+                pdf_hash TEXT NOT NULL,
+                did_document TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_created_at ON dataobjects(created_at DESC)
+        ''')
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
     
     def store_dataobject(self, 
                          data_object: Dict[str, Any],
                          pdf_hash: str,
-                         did_document: Dict[str, Any]) -> str:
+                         did_document: Dict[str, Any],
+                         created_at_override: Optional[datetime] = None) -> str:
         """
         Store a DataObject in the database.
         
@@ -42,29 +99,67 @@ class DataObjectDB:
             data_object: The data object dictionary
             pdf_hash: The hash of the original PDF
             did_document: The DID document associated with the data object
+            created_at_override: Optional timezone-aware creation timestamp, so batch
+                callers can read the clock once and reuse it for every row
             
         Returns:
             The UUID assigned to this data object
         """
         data_uuid = str(uuid.uuid4())
-        created_at = datetime.now().isoformat()
+        created_at = _utc_isoformat(created_at_override)
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self.conn.cursor()
             cursor.execute('''
                 INSERT INTO dataobjects (uuid, created_at, data_object, pdf_hash, did_document)
                 VALUES (?, ?, ?, ?, ?)
             ''', (
                 data_uuid,
                 created_at,
-                json.dumps(data_object),
+                _dumps_json(data_object),
                 pdf_hash,
-                json.dumps(did_document)
+                _dumps_json(did_document)
             ))
-            conn.commit()
         
         return data_uuid
     
+    def store_many(self, rows: Iterable[Tuple[Dict[str, Any], str, Dict[str, Any]]]) -> List[str]:
+        """
+        Store several DataObjects in a single transaction.
+        
+        Args:
+            rows: Iterable of (data_object, pdf_hash, did_document) tuples
+            
+        Returns:
+            The UUIDs assigned to the data objects, in input order
+        """
+        created_at = _utc_isoformat()
+        records = [
+            (
+                str(uuid.uuid4()),
+                created_at,
+                _dumps_json(data_object),
+                pdf_hash,
+                _dumps_json(did_document)
+            )
+            for data_object, pdf_hash, did_document in rows
+        ]
+        
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                cursor.executemany('''
+                    INSERT INTO dataobjects (uuid, created_at, data_object, pdf_hash, did_document)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', records)
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+        
+        return [record[0] for record in records]
+    
     def get_dataobject(self, uuid: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a DataObject by its UUID.
@@ -75,15 +170,15 @@ class DataObjectDB:
         Returns:
             The data object dictionary if found, None otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self.conn.cursor()
             cursor.execute('''
                 SELECT data_object FROM dataobjects WHERE uuid = ?
             ''', (uuid,))
             result = cursor.fetchone()
-            if result:
-                return json.loads(result[0])
-            return None
+        if result:
+            return _loads_json(result[0])
+        return None
     
     def get_pdf_hash(self, uuid: str) -> Optional[str]:
         """
@@ -95,8 +190,8 @@ class DataObjectDB:
         Returns:
             The PDF hash if found, None otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self.conn.cursor()
             cursor.execute('''
                 SELECT pdf_hash FROM dataobjects WHERE uuid = ?
             ''', (uuid,))
@@ -115,15 +210,15 @@ class DataObjectDB:
         Returns:
             The DID document if found, None otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self.conn.cursor()
             cursor.execute('''
                 SELECT did_document FROM dataobjects WHERE uuid = ?
             ''', (uuid,))
             result = cursor.fetchone()
-            if result:
-                return json.loads(result[0])
-            return None
+        if result:
+            return _loads_json(result[0])
+        return None
     
     def list_dataobjects(self, limit: int = 100) -> list:
         """
@@ -135,19 +230,45 @@ class DataObjectDB:
         Returns:
             List of data object dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT uuid, created_at, data_object, pdf_hash, did_document
+                FROM dataobjects
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (limit,))
+            results = cursor.fetchall()
+        return [{
+            "uuid": row[0],
+            "created_at": row[1],
+            "data_object": _loads_json(row[2]),
+            "pdf_hash": row[3],
+            "did_document": _loads_json(row[4])
+        } for row in results]
+    
+    def list_dataobject_columns(self, limit: int = 100) -> Dict[str, List[str]]:
+        """
+        List data objects column by column, leaving the JSON columns undecoded.
+        
+        Callers decode only the rows they render, e.g. with json.loads.
+        
+        Args:
+            limit: Maximum number of records to return
+            
+        Returns:
+            Dictionary mapping each column name to its list of values, newest first
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
             cursor.execute('''
                 SELECT uuid, created_at, data_object, pdf_hash, did_document
                 FROM dataobjects
                 ORDER BY created_at DESC
                 LIMIT ?
             ''', (limit,))
+            columns = [description[0] for description in cursor.description]
             results = cursor.fetchall()
-            return [{
-                "uuid": row[0],
-                "created_at": row[1],
-                "data_object": json.loads(row[2]),
-                "pdf_hash": row[3],
-                "did_document": json.loads(row[4])
-            } for row in results]
\ No newline at end of file
+            if not results:
+                return {column: [] for column in columns}
+            return {column: list(values) for column, values in zip(columns, zip(*results))}
@@ -1,8 +1,10 @@
-from datetime import datetime
-from typing import Union, Dict, Any
+from dataclasses import dataclass
+from datetime import date, datetime, UTC
+from typing import Union, Dict, Any, ClassVar
 import json
+import os
 import xml.etree.ElementTree as ET
-from pathlib import Path
+import functools
 import logging
 
 # Configure logging
@@ -12,16 +14,100 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bound once to skip the attribute lookup per validation
+_FROMISO = datetime.fromisoformat
+
+# Fields shared by every age claim
+_CLAIM_TEMPLATE = {
+    "type": "AgeVerification",
+    "version": "1.0",
+}
+
+@dataclass(slots=True)
+class ValidatedInput:
+    """Input of the age verification process after validation."""
+    date_of_birth: date
+
+def _validate_input(input_data: Dict[str, Any]) -> ValidatedInput:
+    """Validate the input data according to BPMN specification."""
+    date_of_birth = input_data.get("date_of_birth")
+    if not date_of_birth:
+        raise ValueError("Date of birth is required")
+        
+    if type(date_of_birth) is str:
+        try:
+            dob = _FROMISO(date_of_birth)
+        except ValueError:
+            raise ValueError("Date of birth must be in ISO format (YYYY-MM-DD)")
+    elif isinstance(date_of_birth, date):
+        dob = date_of_birth
+    else:
+        raise ValueError("Date of birth must be an ISO format string or a date")
+        
+    return ValidatedInput(date_of_birth=dob)
+        
+def _calculate_age(date_of_birth: date, today: datetime) -> int:
+    """Calculate age according to BPMN specification."""
+    # Compare month and day packed as MMDD integers
+    today_mmdd = today.month * 100 + today.day
+    birth_mmdd = date_of_birth.month * 100 + date_of_birth.day
+    return today.year - date_of_birth.year - (today_mmdd < birth_mmdd)
+        
+def _create_claim(date_of_birth: date, is_over_21: bool, now: datetime) -> Dict[str, Any]:
+    """Create age claim according to BPMN specification."""
+    return {
+        **_CLAIM_TEMPLATE,
+        "date_of_birth": date_of_birth.isoformat(),
+        "is_over_21": is_over_21,
+        "verification_date": now.isoformat(timespec='seconds'),
+        "claim_id": f"age_claim_{now:%Y%m%d_%H%M%S}",
+    }
+
+def compute_age_claim(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate the input, calculate the age and emit the claim.
+    
+    This is the age verification process as a plain function; it needs no
+    BPMN definition at runtime.
+    """
+    # Read the clock once for the whole claim
+    now = datetime.now(UTC)
+    
+    # Validate input
+    validated_data = _validate_input(input_data)
+    
+    # Calculate age
+    age = _calculate_age(validated_data.date_of_birth, now)
+    
+    # Check age condition
+    is_over_21 = age >= 21
+    
+    # Create claim
+    return _create_claim(
+        date_of_birth=validated_data.date_of_birth,
+        is_over_21=is_over_21,
+        now=now
+    )
+
 class BPMNProcessor:
-    def __init__(self, bpmn_file: str):
-        self.bpmn_file = Path(bpmn_file)
-        self.process_definition = self._load_bpmn()
+    # Parsed BPMN roots shared by all processors, keyed by file path
+    _root_cache: ClassVar[Dict[str, ET.Element]] = {}
+    
+    def __init__(self, bpmn_file: Union[str, os.PathLike]):
+        self.bpmn_file = os.fspath(bpmn_file)
+        
+    @functools.cached_property
+    def process_definition(self) -> ET.Element:
+        """The parsed BPMN definition, loaded on first access."""
+        return self._load_bpmn()
         
     def _load_bpmn(self) -> ET.Element:
         """Load and parse the BPMN file."""
         try:
-            tree = ET.parse(self.bpmn_file)
-            return tree.getroot()
+            root = self._root_cache.get(self.bpmn_file)
+            if root is None:
+                root = self._root_cache[self.bpmn_file] = ET.parse(self.bpmn_file).getroot()
+            return root
         except Exception as e:
             logger.error(f"Error loading BPMN file: {str(e)}")
             raise
@@ -32,20 +118,7 @@ class BPMNProcessor:
             # Start event
             logger.info("Starting BPMN process")
             
-            # Validate input
-            validated_data = self._validate_input(input_data)
-            
-            # Calculate age
-            age = self._calculate_age(validated_data["date_of_birth"])
-            
-            # Check age condition
-            is_over_21 = age >= 21
-            
-            # Create claim
-            claim = self._create_claim(
-                date_of_birth=validated_data["date_of_birth"],
-                is_over_21=is_over_21
-            )
+            claim = compute_age_claim(input_data)
             
             logger.info("BPMN process completed successfully")
             return claim
@@ -53,63 +126,19 @@ class BPMNProcessor:
         except Exception as e:
             logger.error(f"Error executing BPMN process: {str(e)}")
             raise
-            
-    def _validate_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate the input data according to BPMN specification."""
-        try:
-            date_of_birth = input_data.get("date_of_birth")
-            if not date_of_birth:
-                raise ValueError("Date of birth is required")
-                
-            if isinstance(date_of_birth, str):
-                try:
-                    dob = datetime.fromisoformat(date_of_birth)
-                except ValueError:
-                    raise ValueError("Date of birth must be in ISO format (YYYY-MM-DD)")
-            else:
-                dob = date_of_birth
-                
-            return {
-                "date_of_birth": dob
-            }
-        except Exception as e:
-            logger.error(f"Error validating input: {str(e)}")
-            raise
-            
-    def _calculate_age(self, date_of_birth: datetime) -> int:
-        """Calculate age according to BPMN specification."""
-        today = datetime.now()
-        age = today.year - date_of_birth.year - (
-            (today.month, today.day) < (date_of_birth.month, date_of_birth.day)
-        )
-        return age
-            
-    def _create_claim(self, date_of_birth: datetime, is_over_21: bool) -> Dict[str, Any]:
-        """Create age claim according to BPMN specification."""
-        claim = {
-            "type": "AgeVerification",
-            "date_of_birth": date_of_birth.isoformat(),
-            "is_over_21": is_over_21,
-            "verification_date": datetime.now().isoformat(),
-            "claim_id": f"age_claim_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            "version": "1.0"
-        }
-        return claim
 
 def verify_age_claim(date_of_birth: Union[str, datetime]) -> bool:
-    """Verify age claim using BPMN process."""
+    """Verify age claim using the age verification process."""
     try:
-        processor = BPMNProcessor("templates/age_verification.bpmn")
-        result = processor.execute({"date_of_birth": date_of_birth})
+        result = compute_age_claim({"date_of_birth": date_of_birth})
         return result["is_over_21"]
     except Exception as e:
         raise ValueError(f"Error processing age claim: {str(e)}")
 
 def create_age_claim(date_of_birth: Union[str, datetime]) -> Dict[str, Any]:
-    """Create age claim using BPMN process."""
+    """Create age claim using the age verification process."""
     try:
-        processor = BPMNProcessor("templates/age_verification.bpmn")
-        return processor.execute({"date_of_birth": date_of_birth})
+        return compute_age_claim({"date_of_birth": date_of_birth})
     except Exception as e:
         raise ValueError(f"Error creating age claim: {str(e)}")
 
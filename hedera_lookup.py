@@ -1,6 +1,12 @@
 import sys
 import json
+import atexit
 import logging
+import logging.handlers
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
 from hedera import (
     Client,
@@ -11,18 +17,33 @@ from hedera import (
     Status
 )
 
-# Configure logging
+# Configure logging; file writes happen on a background listener thread
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.FileHandler('hedera_lookup.log'))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler('hedera_lookup.log')
+        logging.handlers.QueueHandler(_log_queue)
     ]
 )
 
 logger = logging.getLogger(__name__)
 
+# Transaction ID format: accountId@seconds.nanos
+_TXID_RE = re.compile(r'([\d.]+)@(\d+)\.(\d+)')
+
+# Worker threads for issuing independent network queries concurrently
+_QUERY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hedera-query")
+
+# Configured clients shared across lookups, keyed by (operator_id, operator_key, network)
+_clients = {}
+_clients_lock = threading.Lock()
+
 def setup_client(operator_id: str, operator_key: str, network: str = "testnet") -> Client:
     """
     Set up a Hedera client with the given credentials.
@@ -35,12 +56,12 @@ def setup_client(operator_id: str, operator_key: str, network: str = "testnet")
     Returns:
         A configured Hedera client
     """
-    logger.info(f"Setting up Hedera client for {network}")
+    logger.info("Setting up Hedera client for %s", network)
     
     try:
         # Parse operator account ID
         operator = AccountId.fromString(operator_id)
-        logger.debug(f"Operator account ID: {operator}")
+        logger.debug("Operator account ID: %s", operator)
         
         # Parse operator private key
         private_key = PrivateKey.fromString(operator_key)
@@ -60,9 +81,44 @@ def setup_client(operator_id: str, operator_key: str, network: str = "testnet")
         return client
         
     except Exception as e:
-        logger.error(f"Error setting up client: {str(e)}", exc_info=True)
+        logger.error("Error setting up client: %s", e, exc_info=True)
         raise
 
+def get_client(operator_id: str, operator_key: str, network: str = "testnet") -> Client:
+    """
+    Get a shared Hedera client for the given credentials, setting it up on first use.
+    
+    Repeated lookups reuse the same client instead of paying for the SDK
+    class resolution and network bootstrap of setup_client each time. The
+    operator key is passed as its string form, so it works as a cache key.
+    
+    Args:
+        operator_id: The operator account ID
+        operator_key: The operator private key
+        network: The network to connect to (testnet or mainnet)
+        
+    Returns:
+        A configured Hedera client
+    """
+    key = (operator_id, operator_key, network.lower())
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = setup_client(operator_id, operator_key, network)
+            _clients[key] = client
+        return client
+
+@atexit.register
+def close_clients():
+    """Close every client handed out by get_client."""
+    with _clients_lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning("Error closing Hedera client: %s", e)
+        _clients.clear()
+
 def lookup_transaction(client: Client, transaction_id: str) -> dict:
     """
     Look up a transaction on the Hedera network.
@@ -74,31 +130,28 @@ def lookup_transaction(client: Client, transaction_id: str) -> dict:
     Returns:
         Dictionary containing transaction details
     """
-    logger.info(f"Looking up transaction: {transaction_id}")
+    logger.info("Looking up transaction: %s", transaction_id)
     
     try:
         # Parse transaction ID (format: accountId@seconds.nanos)
-        parts = transaction_id.split('@')
-        if len(parts) != 2:
+        match = _TXID_RE.fullmatch(transaction_id)
+        if not match:
             raise ValueError("Invalid transaction ID format. Expected: accountId@seconds.nanos")
             
-        account_id = AccountId.fromString(parts[0])
-        seconds_nanos = parts[1].split('.')
-        if len(seconds_nanos) != 2:
-            raise ValueError("Invalid timestamp format in transaction ID")
-            
-        seconds = int(seconds_nanos[0])
-        nanos = int(seconds_nanos[1])
+        account_str, seconds_str, nanos_str = match.groups()
+        account_id = AccountId.fromString(account_str)
+        seconds = int(seconds_str)
+        nanos = int(nanos_str)
         
         tx_id = TransactionId(account_id, seconds, nanos)
-        logger.debug(f"Parsed transaction ID: {tx_id}")
-        
-        # Query the transaction
-        logger.debug("Querying transaction receipt")
-        receipt = client.getTransactionReceipt(tx_id)
+        logger.debug("Parsed transaction ID: %s", tx_id)
         
-        logger.debug("Querying transaction record")
-        record = client.getTransactionRecord(tx_id)
+        # Query the transaction receipt and record concurrently
+        logger.debug("Querying transaction receipt and record")
+        receipt_future = _QUERY_POOL.submit(client.getTransactionReceipt, tx_id)
+        record_future = _QUERY_POOL.submit(client.getTransactionRecord, tx_id)
+        receipt = receipt_future.result()
+        record = record_future.result()
         
         # Format the response
         result = {
@@ -123,7 +176,7 @@ def lookup_transaction(client: Client, transaction_id: str) -> dict:
         return result
     
     except Exception as e:
-        logger.error(f"Error looking up transaction: {str(e)}", exc_info=True)
+        logger.error("Error looking up transaction: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
@@ -137,13 +190,13 @@ if __name__ == "__main__":
     transaction_id = sys.argv[3]
     network = sys.argv[4] if len(sys.argv) > 4 else "testnet"
     
-    logger.info(f"Starting Hedera transaction lookup for: {transaction_id}")
-    logger.debug(f"Operator ID: {operator_id}")
-    logger.debug(f"Network: {network}")
+    logger.info("Starting Hedera transaction lookup for: %s", transaction_id)
+    logger.debug("Operator ID: %s", operator_id)
+    logger.debug("Network: %s", network)
     
     try:
         # Set up client
-        client = setup_client(operator_id, operator_key, network)
+        client = get_client(operator_id, operator_key, network)
         
         # Look up transaction
         result = lookup_transaction(client, transaction_id)
@@ -153,6 +206,6 @@ if __name__ == "__main__":
         print(json.dumps(result, indent=2))
         
     except Exception as e:
-        logger.error(f"Error in main execution: {str(e)}", exc_info=True)
+        logger.error("Error in main execution: %s", e, exc_info=True)
         print(f"Error: {str(e)}")
         sys.exit(1) 
\ No newline at end of file
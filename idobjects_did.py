@@ -1,9 +1,41 @@
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
-import base58
+from base58_fast import b58decode, b58encode
+import binascii
 import json
 import hashlib
+import orjson
 import time
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Union
+
+# Ownership proofs have a fixed schema, so their canonical form (identical to
+# json.dumps(proof, sort_keys=True)) is filled into a template
+_OWNERSHIP_PROOF_TEMPLATE = (
+    '{"child": %s, "created": %r, "proofPurpose": "parentOwnership", '
+    '"type": "Ed25519Signature2018", "verificationMethod": %s}'
+)
+_json_str = json.encoder.encode_basestring_ascii
+_OWNERSHIP_PROOF_FIELDS = frozenset(
+    ("type", "created", "verificationMethod", "proofPurpose", "child", "signature")
+)
+
+def _ownership_proof_message(child_did: str, created: float, verification_method: str) -> bytes:
+    """Return the canonical bytes signed for an ownership proof."""
+    return (_OWNERSHIP_PROOF_TEMPLATE % (
+        _json_str(child_did), created, _json_str(verification_method)
+    )).encode('utf-8')
+
+# JSON-LD context shared by reference by every idobjects DID document
+_CONTEXT = (
+    "https://www.w3.org/ns/did/v1",
+    {
+        "idobjects": "https://w3id.org/idobjects#",
+        "Ed25519VerificationKey2018": "idobjects:Ed25519VerificationKey2018",
+        "Ed25519Signature2018": "idobjects:Ed25519Signature2018"
+    }
+)
 
 class IdObjectsDID:
     """
@@ -13,14 +45,34 @@ class IdObjectsDID:
     
     def __init__(self, namespace: str = "main"):
         self.namespace = namespace
-        self._did_registry = {}  # In-memory registry to track parent-child relationships
+        # In-memory registry to track parent-child relationships, stored as
+        # parallel lists indexed by each DID's position in _dids
+        self._did_to_idx: Dict[str, int] = {}
+        self._dids: List[str] = []
+        self._docs: List[Optional[dict]] = []  # None for parents not created here
+        self._children: List[List[str]] = []
+        self._verify_keys: List[Optional[ed25519.Ed25519PublicKey]] = []
+        # (child, parent) -> (proof fields the result was computed for, ownership result)
+        self._verify_cache: Dict[Tuple[str, str], Tuple[tuple, bool]] = {}
+        self._priv_key_cache: Dict[Union[str, bytes], ed25519.Ed25519PrivateKey] = {}  # parent seed -> key
+    
+    def _register(self, did: str) -> int:
+        """Return the registry index of a DID, adding an empty slot if it is new."""
+        idx = self._did_to_idx.get(did)
+        if idx is None:
+            idx = self._did_to_idx[did] = len(self._dids)
+            self._dids.append(did)
+            self._docs.append(None)
+            self._children.append([])
+            self._verify_keys.append(None)
+        return idx
     
     def generate_unique_id(self, public_key_bytes: bytes) -> str:
         """Generate a unique identifier from public key bytes."""
         # Create a hash of the public key
         hash_obj = hashlib.sha256(public_key_bytes)
         # Take first 8 bytes and encode in base58
-        return base58.b58encode(hash_obj.digest()[:8]).decode('utf-8')
+        return b58encode(hash_obj.digest()[:8])
     
     def generate_keypair(self):
         """Generate an Ed25519 key pair."""
@@ -30,32 +82,40 @@ class IdObjectsDID:
     
     def encode_multibase(self, key_bytes: bytes) -> str:
         """Encode bytes using base58btc multibase encoding."""
-        return 'z' + base58.b58encode(key_bytes).decode('utf-8')
+        return 'z' + b58encode(key_bytes)
     
     def create_ownership_proof(self, parent_private_key: ed25519.Ed25519PrivateKey, child_did: str) -> dict:
         """Create a cryptographic proof of parent ownership for a child DID."""
         # Create a proof object
+        created = time.time()
+        verification_method = f"{child_did}#parent-ownership"
         proof = {
             "type": "Ed25519Signature2018",
-            "created": time.time(),
-            "verificationMethod": f"{child_did}#parent-ownership",
+            "created": created,
+            "verificationMethod": verification_method,
             "proofPurpose": "parentOwnership",
             "child": child_did
         }
         
         # Create the message to sign
-        message = json.dumps(proof, sort_keys=True).encode('utf-8')
+        message = _ownership_proof_message(child_did, created, verification_method)
         
         # Sign the message
         signature = parent_private_key.sign(message)
         
         # Add the signature to the proof
-        proof["signature"] = base58.b58encode(signature).decode('utf-8')
+        proof["signature"] = b58encode(signature)
         
         return proof
     
-    def create_did(self, parent_did: str = None, parent_private_key: str = None) -> dict:
-        """Create a new idobjects DID, optionally as a child of a parent DID."""
+    def create_did(self, parent_did: str = None,
+                   parent_private_key: Union[str, bytes, ed25519.Ed25519PrivateKey] = None) -> dict:
+        """
+        Create a new idobjects DID, optionally as a child of a parent DID.
+        
+        The parent private key is a key object or the raw 32-byte seed, either
+        as bytes or hex-encoded.
+        """
         # Generate key pair
         private_key, public_key = self.generate_keypair()
         
@@ -74,111 +134,155 @@ class IdObjectsDID:
         # Encode public key
         encoded_public_key = self.encode_multibase(public_key_bytes)
         
+        # Create the ownership proof first, so a bad parent key leaves the registry untouched
+        ownership_proof = None
+        if parent_did and parent_private_key:
+            parent_priv_key = self._load_parent_private_key(parent_private_key)
+            ownership_proof = self.create_ownership_proof(parent_priv_key, did)
+        
+        # Store this DID in registry, keeping its public key object for verification
+        idx = self._register(did)
+        self._verify_keys[idx] = public_key
+        
         # Create DID document
+        key_id = f"{did}#keys-1"
         did_document = {
-            "@context": [
-                "https://www.w3.org/ns/did/v1",
-                {
-                    "idobjects": "https://w3id.org/idobjects#",
-                    "Ed25519VerificationKey2018": "idobjects:Ed25519VerificationKey2018",
-                    "Ed25519Signature2018": "idobjects:Ed25519Signature2018"
-                }
-            ],
+            "@context": _CONTEXT,
             "id": did,
             "controller": did,
-            "children": [],  # Initialize empty children list
+            "children": self._children[idx],  # The registry's children list, updated in place
             "verificationMethod": [{
-                "id": f"{did}#keys-1",
+                "id": key_id,
                 "type": "Ed25519VerificationKey2018",
                 "controller": did,
                 "publicKeyMultibase": encoded_public_key
             }],
-            "authentication": [f"{did}#keys-1"],
-            "assertionMethod": [f"{did}#keys-1"],
-            "capabilityInvocation": [f"{did}#keys-1"],
-            "capabilityDelegation": [f"{did}#keys-1"]
+            "authentication": [key_id],
+            "assertionMethod": [key_id],
+            "capabilityInvocation": [key_id],
+            "capabilityDelegation": [key_id]
         }
         
+        self._docs[idx] = did_document
+        
         # Update parent's children list if this is a child DID
-        if parent_did and parent_private_key:
-            if parent_did not in self._did_registry:
-                self._did_registry[parent_did] = {"children": []}
-            
-            # Create ownership proof
-            parent_priv_key = ed25519.Ed25519PrivateKey.from_private_bytes(
-                bytes.fromhex(parent_private_key)
-            )
-            ownership_proof = self.create_ownership_proof(parent_priv_key, did)
+        if ownership_proof is not None:
+            parent_idx = self._register(parent_did)
             
             # Add proof to child's document
             did_document["proof"] = ownership_proof
             
             # Update parent's children list
-            self._did_registry[parent_did]["children"].append(did)
+            self._children[parent_idx].append(did)
         
-        # Store this DID in registry
-        self._did_registry[did] = {
-            "document": did_document,
-            "children": []
-        }
+        private_key_raw = private_key.private_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PrivateFormat.Raw,
+            encryption_algorithm=serialization.NoEncryption()
+        )
         
         return {
             "did": did,
             "document": did_document,
-            "private_key": private_key.private_bytes(
-                encoding=serialization.Encoding.Raw,
-                format=serialization.PrivateFormat.Raw,
-                encryption_algorithm=serialization.NoEncryption()
-            ).hex()
+            # Hex for JSON export; the raw seed is for creating children in-process
+            "private_key": binascii.hexlify(private_key_raw).decode('ascii'),
+            "private_key_raw": private_key_raw
         }
     
+    def _load_parent_private_key(
+        self, parent_private_key: Union[str, bytes, ed25519.Ed25519PrivateKey]
+    ) -> ed25519.Ed25519PrivateKey:
+        """Return the key object for a parent seed, decoding each seed only once."""
+        if isinstance(parent_private_key, ed25519.Ed25519PrivateKey):
+            return parent_private_key
+        
+        key = self._priv_key_cache.get(parent_private_key)
+        if key is None:
+            seed = parent_private_key
+            if isinstance(seed, str):
+                seed = binascii.unhexlify(seed)
+            key = self._priv_key_cache[parent_private_key] = ed25519.Ed25519PrivateKey.from_private_bytes(seed)
+        return key
+    
     def verify_ownership(self, child_did: str, parent_did: str) -> bool:
-        """Verify that a parent DID owns a child DID."""
-        if child_did not in self._did_registry:
+        """
+        Verify that a parent DID owns a child DID.
+        
+        Results are memoized per DID pair together with the proof they were
+        computed for, so an edited proof is verified again.
+        """
+        child_idx = self._did_to_idx.get(child_did)
+        child_doc = None if child_idx is None else self._docs[child_idx]
+        if child_doc is None or not isinstance(child_doc.get("proof"), dict):
             return False
         
-        child_doc = self._did_registry[child_did]["document"]
-        if "proof" not in child_doc:
+        key = (child_did, parent_did)
+        proof_state = tuple(child_doc["proof"].items())
+        cached = self._verify_cache.get(key)
+        if cached is not None and cached[0] == proof_state:
+            return cached[1]
+        
+        result = self._verify_ownership_uncached(child_did, parent_did)
+        if parent_did in self._did_to_idx:
+            self._verify_cache[key] = (proof_state, result)
+        return result
+    
+    def _verify_ownership_uncached(self, child_did: str, parent_did: str) -> bool:
+        """Check the ownership proof of a child DID against the parent's key."""
+        child_idx = self._did_to_idx.get(child_did)
+        if child_idx is None:
+            return False
+        
+        child_doc = self._docs[child_idx]
+        if child_doc is None or "proof" not in child_doc:
             return False
         
         proof = child_doc["proof"]
-        if proof["type"] != "Ed25519Signature2018" or proof["child"] != child_did:
+        if (proof.keys() != _OWNERSHIP_PROOF_FIELDS
+                or proof["type"] != "Ed25519Signature2018"
+                or proof["proofPurpose"] != "parentOwnership"
+                or proof["child"] != child_did):
             return False
         
         # Get parent's public key from registry
-        if parent_did not in self._did_registry:
+        parent_idx = self._did_to_idx.get(parent_did)
+        if parent_idx is None:
             return False
         
-        parent_doc = self._did_registry[parent_did]["document"]
-        parent_pub_key = None
-        for vm in parent_doc["verificationMethod"]:
-            if vm["type"] == "Ed25519VerificationKey2018":
-                parent_pub_key = base58.b58decode(vm["publicKeyMultibase"][1:])
-                break
-        
-        if not parent_pub_key:
+        parent_pub_key_obj = self._verify_keys[parent_idx]
+        if parent_pub_key_obj is None:
             return False
         
-        # Verify the signature
-        parent_pub_key_obj = ed25519.Ed25519PublicKey.from_public_bytes(parent_pub_key)
-        message = json.dumps({k: v for k, v in proof.items() if k != "signature"}, sort_keys=True).encode('utf-8')
-        signature = base58.b58decode(proof["signature"])
-        
+        # Rebuild the signed message from the document's proof and verify its signature
         try:
-            parent_pub_key_obj.verify(signature, message)
+            message = _ownership_proof_message(child_did, proof["created"], proof["verificationMethod"])
+            parent_pub_key_obj.verify(b58decode(proof["signature"]), message)
             return True
-        except:
+        except (InvalidSignature, TypeError, ValueError):
             return False
     
+    def verify_ownership_batch(self, pairs: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Verify many (child_did, parent_did) ownership edges, e.g. a whole subtree.
+        
+        Each distinct edge is verified once and results are returned in input order.
+        """
+        verified: Dict[Tuple[str, str], bool] = {}
+        for pair in pairs:
+            if pair not in verified:
+                verified[pair] = self.verify_ownership(*pair)
+        return [verified[pair] for pair in pairs]
+    
     def attempt_parent_calculation(self, child_did: str) -> dict:
         """
         Attempt to calculate the parent DID from a child DID.
         This demonstrates that it's impossible to derive the parent DID from the child.
         """
-        if child_did not in self._did_registry:
+        child_idx = self._did_to_idx.get(child_did)
+        child_doc = None if child_idx is None else self._docs[child_idx]
+        if child_doc is None:
             return {"error": "Child DID not found"}
         
-        child_doc = self._did_registry[child_did]["document"]
         if "proof" not in child_doc:
             return {"error": "No ownership proof found"}
         
@@ -204,7 +308,7 @@ class IdObjectsDID:
         child_pub_key = None
         for vm in child_doc["verificationMethod"]:
             if vm["type"] == "Ed25519VerificationKey2018":
-                child_pub_key = base58.b58decode(vm["publicKeyMultibase"][1:])
+                child_pub_key = b58decode(vm["publicKeyMultibase"][1:])
                 break
         
         key_analysis = {
@@ -224,15 +328,20 @@ class IdObjectsDID:
         }
     
     def resolve_did(self, did: str) -> dict:
-        """Resolve a DID to its DID document."""
+        """
+        Resolve a DID to its DID document.
+        
+        Registered documents are returned as a read-only view of the stored
+        document, which already carries the current children list. The view is
+        shallow: nested lists are shared with the registry and must not be
+        modified. Convert it with dict(...) before serializing.
+        """
         if not did.startswith(f"did:idobjects:{self.namespace}:"):
             raise ValueError("Invalid idobjects DID format")
         
-        if did in self._did_registry:
-            # Get the document and update children from registry
-            document = self._did_registry[did]["document"].copy()
-            document["children"] = self._did_registry[did]["children"]
-            return {"didDocument": document}
+        idx = self._did_to_idx.get(did)
+        if idx is not None and self._docs[idx] is not None:
+            return {"didDocument": MappingProxyType(self._docs[idx])}
         
         return {
             "didDocument": {
@@ -250,16 +359,16 @@ if __name__ == "__main__":
     root_result = idobjects.create_did()
     print("Root DID:", root_result["did"])
     print("\nRoot DID Document:")
-    print(json.dumps(root_result["document"], indent=2))
+    print(orjson.dumps(root_result["document"], option=orjson.OPT_INDENT_2).decode())
     
     # Create a child DID with parent ownership proof
     child_result = idobjects.create_did(
         parent_did=root_result["did"],
-        parent_private_key=root_result["private_key"]
+        parent_private_key=root_result["private_key_raw"]
     )
     print("\nChild DID:", child_result["did"])
     print("\nChild DID Document:")
-    print(json.dumps(child_result["document"], indent=2))
+    print(orjson.dumps(child_result["document"], option=orjson.OPT_INDENT_2).decode())
     
     # Verify ownership
     is_owned = idobjects.verify_ownership(child_result["did"], root_result["did"])
@@ -268,16 +377,16 @@ if __name__ == "__main__":
     # Attempt to calculate parent DID from child
     print("\nAttempting to calculate parent DID from child:")
     parent_calc_result = idobjects.attempt_parent_calculation(child_result["did"])
-    print(json.dumps(parent_calc_result, indent=2))
+    print(orjson.dumps(parent_calc_result, option=orjson.OPT_INDENT_2).decode())
     
     # Create a grandchild DID
     grandchild_result = idobjects.create_did(
         parent_did=child_result["did"],
-        parent_private_key=child_result["private_key"]
+        parent_private_key=child_result["private_key_raw"]
     )
     print("\nGrandchild DID:", grandchild_result["did"])
     print("\nGrandchild DID Document:")
-    print(json.dumps(grandchild_result["document"], indent=2))
+    print(orjson.dumps(grandchild_result["document"], option=orjson.OPT_INDENT_2).decode())
     
     # Verify grandchild ownership
     is_grandchild_owned = idobjects.verify_ownership(grandchild_result["did"], child_result["did"])
@@ -286,11 +395,11 @@ if __name__ == "__main__":
     # Attempt to calculate parent DID from grandchild
     print("\nAttempting to calculate parent DID from grandchild:")
     grandchild_parent_calc = idobjects.attempt_parent_calculation(grandchild_result["did"])
-    print(json.dumps(grandchild_parent_calc, indent=2))
+    print(orjson.dumps(grandchild_parent_calc, option=orjson.OPT_INDENT_2).decode())
     
     # Resolve and show updated documents with children
     print("\nResolved Root DID Document (with children):")
-    print(json.dumps(idobjects.resolve_did(root_result["did"])["didDocument"], indent=2))
+    print(orjson.dumps(dict(idobjects.resolve_did(root_result["did"])["didDocument"]), option=orjson.OPT_INDENT_2).decode())
     
     print("\nResolved Child DID Document (with children):")
-    print(json.dumps(idobjects.resolve_did(child_result["did"])["didDocument"], indent=2)) 
\ No newline at end of file
+    print(orjson.dumps(dict(idobjects.resolve_did(child_result["did"])["didDocument"]), option=orjson.OPT_INDENT_2).decode()) 
\ No newline at end of file
@@ -1,10 +1,12 @@
-from datetime import datetime
+import time
+from datetime import date
 
 def is_over_21(dob_string):
-    dob = datetime.strptime(dob_string, '%Y-%m-%d')
-    today = datetime.now()
-    age_21_date = datetime(dob.year + 21, dob.month, dob.day)
-    return today >= age_21_date
+    # Parse the fixed YYYY-MM-DD format directly instead of through strptime
+    year, month, day = map(int, dob_string.split('-'))
+    date(year, month, day)  # Raises ValueError for dates that do not exist
+    today = time.localtime()
+    return (today.tm_year, today.tm_mon, today.tm_mday) >= (year + 21, month, day)
 
 # Example usage
 input_data = {
@@ -1,24 +1,35 @@
 import sys
 import os
-import json
 import hashlib
+import io
+import atexit
 import logging
-from datetime import datetime, UTC
+import logging.handlers
+import queue
+import orjson
+from datetime import datetime, timedelta, UTC
 from pathlib import Path
 from PyPDF2 import PdfReader, PdfWriter
 from data_object import DataObject, ValidityCondition
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('pdf_data_object.log')
-    ]
-)
+# Configure logging; WARNING unless IDOBJECTS_LOG_LEVEL asks for more, and
+# file writes happen on a background listener thread
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.FileHandler('pdf_data_object.log'))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
+# Only this module's logger is configured, leaving the root logger to the importer
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.getLevelNamesMapping().get(
+    os.environ.get('IDOBJECTS_LOG_LEVEL', 'WARNING').upper(), logging.WARNING
+))
+logger.propagate = False
+
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+for _handler in (logging.StreamHandler(sys.stdout), logging.handlers.QueueHandler(_log_queue)):
+    _handler.setFormatter(_log_formatter)
+    logger.addHandler(_handler)
 
 def create_pdf_data_object(pdf_path: str, did_document: dict, owner_public_key: str, output_dir: str = None) -> dict:
     """
@@ -33,7 +44,7 @@ def create_pdf_data_object(pdf_path: str, did_document: dict, owner_public_key:
     Returns:
         Dictionary containing the data object and output file path
     """
-    logger.info(f"Creating data object for PDF: {pdf_path}")
+    logger.info("Creating data object for PDF: %s", pdf_path)
     
     try:
         # Extract owner DID from the document
@@ -41,25 +52,26 @@ def create_pdf_data_object(pdf_path: str, did_document: dict, owner_public_key:
         if not owner_did:
             raise ValueError("DID document is missing 'id' field")
         
-        # Read the PDF file
+        # Read the PDF file once; the hash and the reader share the buffer
         logger.debug("Reading PDF file")
-        pdf_reader = PdfReader(pdf_path)
+        with open(pdf_path, 'rb') as f:
+            pdf_content = f.read()
+        pdf_reader = PdfReader(io.BytesIO(pdf_content))
         
         # Calculate PDF hash
         logger.debug("Calculating PDF hash")
-        with open(pdf_path, 'rb') as f:
-            pdf_content = f.read()
-            pdf_hash = hashlib.sha256(pdf_content).hexdigest()
+        pdf_hash = hashlib.sha256(pdf_content).hexdigest()
         
-        # Create content for the data object
+        # Create content for the data object, reading the clock once
         logger.debug("Creating data object content")
+        now = datetime.now(UTC)
         content = {
             "pdf_hash": pdf_hash,
             "page_count": len(pdf_reader.pages),
             "original_filename": os.path.basename(pdf_path),
             "metadata": {
-                "created_at": datetime.now(UTC).isoformat(),
-                "file_size": os.path.getsize(pdf_path),
+                "created_at": now.isoformat(),
+                "file_size": len(pdf_content),
                 "mime_type": "application/pdf"
             }
         }
@@ -70,7 +82,7 @@ def create_pdf_data_object(pdf_path: str, did_document: dict, owner_public_key:
             {
                 "type": "expiration",
                 "parameters": {
-                    "date": datetime.now(UTC).replace(year=datetime.now(UTC).year + 1).isoformat()
+                    "date": (now + timedelta(days=365)).isoformat()
                 },
                 "description": "Document expires in one year"
             }
@@ -90,9 +102,8 @@ def create_pdf_data_object(pdf_path: str, did_document: dict, owner_public_key:
         logger.debug("Creating PDF copy with metadata")
         pdf_writer = PdfWriter()
         
-        # Copy all pages
-        for page in pdf_reader.pages:
-            pdf_writer.add_page(page)
+        # Copy all pages in one pass over the in-memory reader
+        pdf_writer.append_pages_from_reader(pdf_reader)
         
         # Add metadata
         metadata = {
@@ -102,7 +113,7 @@ def create_pdf_data_object(pdf_path: str, did_document: dict, owner_public_key:
         }
         
         pdf_writer.add_metadata({
-            "/DataObject": json.dumps(metadata)
+            "/DataObject": orjson.dumps(metadata).decode()
         })
         
         # Determine output path
@@ -113,7 +124,7 @@ def create_pdf_data_object(pdf_path: str, did_document: dict, owner_public_key:
         output_path = os.path.join(output_dir, output_filename)
         
         # Save the new PDF
-        logger.info(f"Saving output PDF to: {output_path}")
+        logger.info("Saving output PDF to: %s", output_path)
         with open(output_path, 'wb') as output_file:
             pdf_writer.write(output_file)
         
@@ -125,7 +136,7 @@ def create_pdf_data_object(pdf_path: str, did_document: dict, owner_public_key:
         }
     
     except Exception as e:
-        logger.error(f"Error creating data object: {str(e)}", exc_info=True)
+        logger.error("Error creating data object: %s", e, exc_info=True)
         raise
 
 def verify_pdf_data_object(pdf_path: str, owner_private_key: str) -> dict:
@@ -139,12 +150,14 @@ def verify_pdf_data_object(pdf_path: str, owner_private_key: str) -> dict:
     Returns:
         Dictionary containing verification results
     """
-    logger.info(f"Verifying PDF data object: {pdf_path}")
+    logger.info("Verifying PDF data object: %s", pdf_path)
     
     try:
-        # Read the PDF and its metadata
+        # Read the PDF once; the metadata and the hash come from the same buffer
         logger.debug("Reading PDF metadata")
-        pdf_reader = PdfReader(pdf_path)
+        with open(pdf_path, 'rb') as f:
+            pdf_content = f.read()
+        pdf_reader = PdfReader(io.BytesIO(pdf_content))
         metadata = pdf_reader.metadata
         
         if not metadata or "/DataObject" not in metadata:
@@ -154,9 +167,9 @@ def verify_pdf_data_object(pdf_path: str, owner_private_key: str) -> dict:
                 "error": "No data object metadata found"
             }
         
-        # Parse the metadata
+        # Parse the metadata; PyPDF2 returns a str subclass, which orjson rejects
         logger.debug("Parsing data object metadata")
-        data_object_metadata = json.loads(metadata["/DataObject"])
+        data_object_metadata = orjson.loads(str(metadata["/DataObject"]))
         data_object_dict = data_object_metadata["data_object"]
         
         # Create DataObject instance
@@ -164,9 +177,7 @@ def verify_pdf_data_object(pdf_path: str, owner_private_key: str) -> dict:
         
         # Verify the PDF hash
         logger.debug("Verifying PDF hash")
-        with open(pdf_path, 'rb') as f:
-            pdf_content = f.read()
-            current_hash = hashlib.sha256(pdf_content).hexdigest()
+        current_hash = hashlib.sha256(pdf_content).hexdigest()
         
         if current_hash != data_object_metadata["pdf_hash"]:
             logger.warning("PDF content has been modified")
@@ -196,7 +207,7 @@ def verify_pdf_data_object(pdf_path: str, owner_private_key: str) -> dict:
         }
     
     except Exception as e:
-        logger.error(f"Error verifying data object: {str(e)}", exc_info=True)
+        logger.error("Error verifying data object: %s", e, exc_info=True)
         return {
             "valid": False,
             "error": str(e)
@@ -213,18 +224,18 @@ if __name__ == "__main__":
     public_key_path = sys.argv[3]
     output_dir = sys.argv[4] if len(sys.argv) > 4 else None
     
-    logger.info(f"Starting PDF data object creation for: {pdf_path}")
-    logger.debug(f"DID document path: {did_document_path}")
-    logger.debug(f"Public key path: {public_key_path}")
-    logger.debug(f"Output directory: {output_dir}")
+    logger.info("Starting PDF data object creation for: %s", pdf_path)
+    logger.debug("DID document path: %s", did_document_path)
+    logger.debug("Public key path: %s", public_key_path)
+    logger.debug("Output directory: %s", output_dir)
     
     # Read the DID document
     try:
-        with open(did_document_path, 'r') as f:
-            did_document = json.load(f)
+        with open(did_document_path, 'rb') as f:
+            did_document = orjson.loads(f.read())
         logger.debug("DID document loaded successfully")
     except Exception as e:
-        logger.error(f"Error reading DID document: {str(e)}")
+        logger.error("Error reading DID document: %s", e)
         sys.exit(1)
     
     # Read the public key
@@ -233,7 +244,7 @@ if __name__ == "__main__":
             public_key = f.read()
         logger.debug("Public key loaded successfully")
     except Exception as e:
-        logger.error(f"Error reading public key: {str(e)}")
+        logger.error("Error reading public key: %s", e)
         sys.exit(1)
     
     try:
@@ -242,8 +253,8 @@ if __name__ == "__main__":
         print(f"Output PDF: {result['output_path']}")
         print(f"PDF Hash: {result['pdf_hash']}")
         print("\nData Object:")
-        print(json.dumps(result['data_object'], indent=2))
+        print(orjson.dumps(result['data_object'], option=orjson.OPT_INDENT_2).decode())
     except Exception as e:
-        logger.error(f"Error in main execution: {str(e)}", exc_info=True)
+        logger.error("Error in main execution: %s", e, exc_info=True)
         print(f"Error: {str(e)}")
         sys.exit(1) 
\ No newline at end of file
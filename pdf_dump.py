@@ -11,6 +11,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Buffer size used when reading PDF files
+PDF_READ_BUFFER_SIZE = 1 << 20  # 1 MiB
+
 def dump_pdf_metadata(pdf_path: str) -> dict:
     """
     Extract and display metadata from a PDF file, including our custom DataObject metadata.
@@ -27,37 +30,39 @@ def dump_pdf_metadata(pdf_path: str) -> dict:
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
             
         logger.info(f"Reading PDF: {pdf_path}")
-        pdf_reader = PdfReader(pdf_path)
+        with open(pdf_path, 'rb', buffering=PDF_READ_BUFFER_SIZE) as pdf_file:
+            pdf_reader = PdfReader(pdf_file, strict=False)
+            pdf_info = pdf_reader.metadata or {}
         
-        # Get standard PDF metadata
-        metadata = {
-            "Standard Metadata": {
-                "Title": pdf_reader.metadata.get("/Title"),
-                "Author": pdf_reader.metadata.get("/Author"),
-                "Subject": pdf_reader.metadata.get("/Subject"),
-                "Keywords": pdf_reader.metadata.get("/Keywords"),
-                "Creator": pdf_reader.metadata.get("/Creator"),
-                "Producer": pdf_reader.metadata.get("/Producer"),
-                "CreationDate": pdf_reader.metadata.get("/CreationDate"),
-                "ModDate": pdf_reader.metadata.get("/ModDate")
+            # Get standard PDF metadata
+            metadata = {
+                "Standard Metadata": {
+                    "Title": pdf_info.get("/Title"),
+                    "Author": pdf_info.get("/Author"),
+                    "Subject": pdf_info.get("/Subject"),
+                    "Keywords": pdf_info.get("/Keywords"),
+                    "Creator": pdf_info.get("/Creator"),
+                    "Producer": pdf_info.get("/Producer"),
+                    "CreationDate": pdf_info.get("/CreationDate"),
+                    "ModDate": pdf_info.get("/ModDate")
+                }
             }
-        }
         
-        # Get our custom DataObject metadata
-        if "/DataObject" in pdf_reader.metadata:
-            try:
-                data_object = json.loads(pdf_reader.metadata["/DataObject"])
-                metadata["DataObject"] = data_object
-            except json.JSONDecodeError:
-                logger.warning("Could not parse DataObject metadata as JSON")
-                metadata["DataObject"] = pdf_reader.metadata["/DataObject"]
+            # Get our custom DataObject metadata
+            if "/DataObject" in pdf_info:
+                try:
+                    data_object = json.loads(pdf_info["/DataObject"])
+                    metadata["DataObject"] = data_object
+                except json.JSONDecodeError:
+                    logger.warning("Could not parse DataObject metadata as JSON")
+                    metadata["DataObject"] = pdf_info["/DataObject"]
         
-        # Add additional useful information
-        metadata["Additional Info"] = {
-            "Page Count": len(pdf_reader.pages),
-            "File Size": pdf_path.stat().st_size,
-            "File Path": str(pdf_path)
-        }
+            # Add additional useful information
+            metadata["Additional Info"] = {
+                "Page Count": len(pdf_reader.pages),
+                "File Size": pdf_path.stat().st_size,
+                "File Path": str(pdf_path)
+            }
         
         return metadata
     